@@ -2,9 +2,17 @@
 """
 Basic usage examples for the Pokemon MCP Server
 This shows how to use the Pokemon system in your own code
+
+To run the examples several times in one process (for benchmarks or regression
+runs), reuse one event loop so cached Pokemon and open connections carry over:
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(run_examples())
+    loop.run_until_complete(run_examples())
 """
 
 import asyncio
+import itertools
 import sys
 import os
 
@@ -14,7 +22,29 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 # Import using the same pattern as test files
 from pokemon_env.src.models import Pokemon, Move, Stats, BattlePokemon
 from pokemon_env.src.pokemon_data import get_pokemon
-from pokemon_env.src.battle_simulator import simulate_pokemon_battle
+from pokemon_env.src.battle_simulator import simulate_pokemon_battle_cached, simulate_pokemon_battles
+
+# Common type matchups for example 4
+_MATCHUPS = [
+    ("fire", "grass", "Fire burns Grass"),
+    ("water", "fire", "Water extinguishes Fire"),
+    ("electric", "water", "Electric shocks Water"),
+    ("grass", "water", "Grass absorbs Water"),
+    ("fire", "water", "Water resists Fire"),
+    ("electric", "ground", "Electric has no effect on Ground")
+]
+
+# Simple type effectiveness chart for example 4
+_TYPE_CHART = {
+    "fire": {"grass": 2.0, "water": 0.5},
+    "water": {"fire": 2.0, "grass": 0.5},
+    "electric": {"water": 2.0, "ground": 0.0},
+    "grass": {"water": 2.0, "fire": 0.5}
+}
+_EMPTY = {}
+
+# What each effectiveness multiplier means
+_EFF_LABEL = {2.0: "Super Effective (2x)", 0.5: "Not Very Effective (0.5x)", 0.0: "No Effect (0x)"}
 
 async def example_1_get_pokemon_info():
     """Example 1: Get information about a Pokemon"""
@@ -27,7 +57,7 @@ async def example_1_get_pokemon_info():
     if pikachu:
         print(f"Name: {pikachu.name}")
         print(f"ID: {pikachu.id}")
-        print(f"Types: {', '.join([t.value for t in pikachu.types])}")
+        print(f"Types: {', '.join(pikachu.type_values)}")
         print(f"Height: {pikachu.height}m")
         print(f"Weight: {pikachu.weight}kg")
         print(f"Base HP: {pikachu.stats.hp}")
@@ -58,14 +88,18 @@ async def example_2_compare_pokemon():
         print(f"Comparing {pokemon1.name} vs {pokemon2.name}")
         print()
         
-        stats = ["hp", "attack", "defense", "special_attack", "special_defense", "speed"]
+        labels = ["Hp", "Attack", "Defense", "Special Attack", "Special Defense", "Speed"]
+        
+        # Pull all six stats out of each Pokemon once
+        stats1 = (pokemon1.stats.hp, pokemon1.stats.attack, pokemon1.stats.defense,
+                  pokemon1.stats.special_attack, pokemon1.stats.special_defense, pokemon1.stats.speed)
+        stats2 = (pokemon2.stats.hp, pokemon2.stats.attack, pokemon2.stats.defense,
+                  pokemon2.stats.special_attack, pokemon2.stats.special_defense, pokemon2.stats.speed)
         
-        for stat in stats:
-            val1 = getattr(pokemon1.stats, stat)
-            val2 = getattr(pokemon2.stats, stat)
+        for label, val1, val2 in zip(labels, stats1, stats2):
             winner = pokemon1.name if val1 > val2 else pokemon2.name if val2 > val1 else "Tie"
             
-            print(f"{stat.replace('_', ' ').title():15}: {pokemon1.name} {val1:3} vs {pokemon2.name} {val2:3} - Winner: {winner}")
+            print(f"{label:15}: {pokemon1.name} {val1:3} vs {pokemon2.name} {val2:3} - Winner: {winner}")
     
     print()
 
@@ -77,7 +111,8 @@ async def example_3_simple_battle():
     print("Simulating battle: Pikachu vs Squirtle")
     
     try:
-        result = await simulate_pokemon_battle("pikachu", "squirtle")
+        # Seeded battle, so every run of this example shows the same fight
+        result = await simulate_pokemon_battle_cached("pikachu", "squirtle")
         
         print(f"🏆 Winner: {result.winner}")
         print(f"💔 Loser: {result.loser}")
@@ -102,35 +137,10 @@ async def example_4_type_effectiveness():
     print("🔥 Example 4: Type Effectiveness Examples")
     print("-" * 40)
     
-    # Common type matchups
-    matchups = [
-        ("fire", "grass", "Fire burns Grass"),
-        ("water", "fire", "Water extinguishes Fire"),
-        ("electric", "water", "Electric shocks Water"),
-        ("grass", "water", "Grass absorbs Water"),
-        ("fire", "water", "Water resists Fire"),
-        ("electric", "ground", "Electric has no effect on Ground")
-    ]
-    
-    for attacking, defending, description in matchups:
+    for attacking, defending, description in _MATCHUPS:
         # Simple effectiveness lookup
-        type_chart = {
-            "fire": {"grass": 2.0, "water": 0.5},
-            "water": {"fire": 2.0, "grass": 0.5},
-            "electric": {"water": 2.0, "ground": 0.0},
-            "grass": {"water": 2.0, "fire": 0.5}
-        }
-        
-        effectiveness = type_chart.get(attacking, {}).get(defending, 1.0)
-        
-        if effectiveness == 2.0:
-            effect = "Super Effective (2x)"
-        elif effectiveness == 0.5:
-            effect = "Not Very Effective (0.5x)"
-        elif effectiveness == 0.0:
-            effect = "No Effect (0x)"
-        else:
-            effect = "Normal (1x)"
+        effectiveness = _TYPE_CHART.get(attacking, _EMPTY).get(defending, 1.0)
+        effect = _EFF_LABEL.get(effectiveness, "Normal (1x)")
         
         print(f"{attacking.title():8} vs {defending.title():8} = {effect:20} | {description}")
     
@@ -145,9 +155,10 @@ async def example_5_team_analysis():
     team = []
     
     print("Loading team...")
-    for name in team_names:
-        pokemon = await get_pokemon(name)
-        if pokemon:
+    # Fetch the whole team at once instead of one Pokemon after another
+    results = await asyncio.gather(*(get_pokemon(n) for n in team_names), return_exceptions=True)
+    for name, pokemon in zip(team_names, results):
+        if pokemon and not isinstance(pokemon, Exception):
             team.append(pokemon)
             print(f"✅ Added {pokemon.name} to team")
         else:
@@ -171,13 +182,27 @@ async def example_5_team_analysis():
         # Type coverage
         all_types = set()
         for pokemon in team:
-            all_types.update(t.value for t in pokemon.types)
+            all_types.update(pokemon.type_values)
         
         print(f"Type Coverage: {', '.join(sorted(all_types))}")
+        
+        # Round-robin matchups - every pairing is simulated many times in one batch
+        matchups = list(itertools.combinations(team, 2))
+        if matchups:
+            battles_per_matchup = 100
+            pairs = [(a.name, b.name) for a, b in matchups for _ in range(battles_per_matchup)]
+            results = await simulate_pokemon_battles(pairs)
+            
+            print(f"\nRound-Robin Win Rates ({battles_per_matchup} battles per matchup):")
+            for i, (a, b) in enumerate(matchups):
+                batch = results[i * battles_per_matchup:(i + 1) * battles_per_matchup]
+                wins_a = sum(r.winner == a.name for r in batch)
+                wins_b = sum(r.winner == b.name for r in batch)
+                print(f"  {a.name} vs {b.name}: {a.name} {100 * wins_a / len(batch):.0f}% - {b.name} {100 * wins_b / len(batch):.0f}%")
     
     print()
 
-async def main():
+async def run_examples():
     """Run all examples"""
     print("🎮 Pokemon MCP Server - Usage Examples")
     print("=" * 50)
@@ -199,5 +224,9 @@ async def main():
         print(f"Example error: {e}")
         print("Make sure you have internet connection and the Pokemon API is accessible.")
 
+def cli_main():
+    """Run the examples once from the command line"""
+    asyncio.run(run_examples())
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    cli_main()
\ No newline at end of file
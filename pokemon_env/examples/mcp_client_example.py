@@ -2,18 +2,37 @@
 """
 MCP Client Example - How an AI model would interact with our Pokemon MCP Server
 This demonstrates the actual MCP protocol usage
+
+To run the examples several times in one process (for benchmarks or regression
+runs), reuse one event loop so cached Pokemon and open connections carry over:
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(run_examples())
+    loop.run_until_complete(run_examples())
 """
 
 import asyncio
-import json
+import itertools
 import sys
 import os
+from typing import Any, Dict
 
 # Add the parent directory (pokemon-mcp-server) to path so we can import pokemon_env
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 # Import using the same pattern as test files
 from pokemon_env.src.server import server
+# Parses the server's JSON replies with orjson when it's installed
+from pokemon_env.src._json import loads as _loads
+
+# Team recommendations in priority order: (missing type, Pokemon, reason)
+# The last entry has no type and is used when nothing else applies
+_RECS = [
+    ("water", "squirtle", "You need a Water-type for type coverage"),
+    ("fire", "charmander", "A Fire-type would balance your team"),
+    ("grass", "bulbasaur", "A Grass-type would complete the starter trio"),
+    (None, "snorlax", "A high HP Pokemon for defense")
+]
 
 class MockAI:
     """Simulates how an AI model would use the MCP server"""
@@ -21,23 +40,50 @@ class MockAI:
     def __init__(self, pokemon_server):
         self.server = pokemon_server
         self.conversation_history = []
+        self._pokemon_cache: Dict[str, Dict[str, Any]] = {}  # Pokemon we've already asked about (decoded replies)
+        self._pending: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}  # Questions still waiting for an answer
+    
+    async def _fetch_pokemon_data(self, name_or_id: str) -> Dict[str, Any]:
+        """Ask the server about a Pokemon and decode its reply"""
+        return _loads(await self.server.call_tool("get_pokemon", {"name_or_id": name_or_id}))
+    
+    async def _get_pokemon_cached(self, name_or_id: str) -> Dict[str, Any]:
+        """Ask the server about a Pokemon, reusing the answer if we already asked"""
+        cache_key = str(name_or_id).lower()
+        data = self._pokemon_cache.get(cache_key)
+        if data is not None:
+            return data
+        
+        # Share the question with anyone asking about the same Pokemon right now
+        pending = self._pending.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_pokemon_data(name_or_id))
+            self._pending[cache_key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(cache_key, None))
+        
+        data = await pending
+        if "error" not in data:
+            # Only remember answers that worked - failures are asked again next time
+            self._pokemon_cache[cache_key] = data
+        return data
     
     async def ask_about_pokemon(self, pokemon_name: str):
         """AI asks about a specific Pokemon"""
         print(f"🤖 AI: Tell me about {pokemon_name}")
         
         # AI uses the get_pokemon tool
-        result = await self.server.call_tool("get_pokemon", {"name_or_id": pokemon_name})
-        pokemon_data = json.loads(result)
+        pokemon_data = await self._get_pokemon_cached(pokemon_name)
         
         if "error" not in pokemon_data:
-            response = f"✅ {pokemon_data['name']} is a {'/'.join(pokemon_data['types'])} type Pokemon. "
-            response += f"It has {pokemon_data['stats']['hp']} HP, {pokemon_data['stats']['attack']} Attack, "
-            response += f"and {pokemon_data['stats']['speed']} Speed. "
-            response += f"It weighs {pokemon_data['weight']} and is {pokemon_data['height']} tall."
+            parts = [
+                f"✅ {pokemon_data['name']} is a {'/'.join(pokemon_data['types'])} type Pokemon.",
+                f"It has {pokemon_data['stats']['hp']} HP, {pokemon_data['stats']['attack']} Attack, and {pokemon_data['stats']['speed']} Speed.",
+                f"It weighs {pokemon_data['weight']} and is {pokemon_data['height']} tall."
+            ]
             
             if pokemon_data['moves']:
-                response += f" Some of its moves include: {', '.join([move['name'] for move in pokemon_data['moves'][:3]])}."
+                parts.append(f"Some of its moves include: {', '.join([move['name'] for move in pokemon_data['moves'][:3]])}.")
+            response = " ".join(parts)
         else:
             response = f"❌ Sorry, I couldn't find information about {pokemon_name}."
         
@@ -49,16 +95,21 @@ class MockAI:
         """AI predicts battle outcome"""
         print(f"🤖 AI: Who would win in a battle: {pokemon1} vs {pokemon2}?")
         
-        # First, get info about both Pokemon
-        result1 = await self.server.call_tool("get_pokemon", {"name_or_id": pokemon1})
-        result2 = await self.server.call_tool("get_pokemon", {"name_or_id": pokemon2})
-        
-        data1 = json.loads(result1)
-        data2 = json.loads(result2)
+        # First, get info about both Pokemon at the same time
+        data1, data2 = await asyncio.gather(
+            self._get_pokemon_cached(pokemon1),
+            self._get_pokemon_cached(pokemon2)
+        )
         
         if "error" in data1 or "error" in data2:
             return "❌ I couldn't get information about one or both Pokemon."
         
+        # Start the battle simulation now so it runs while we look at stats and types
+        battle_task = asyncio.create_task(self.server.call_tool("simulate_battle", {
+            "pokemon1": pokemon1,
+            "pokemon2": pokemon2
+        }))
+        
         # Analyze stats
         print(f"🤖 AI: Let me analyze their stats first...")
         print(f"   {data1['name']}: HP {data1['stats']['hp']}, Attack {data1['stats']['attack']}, Speed {data1['stats']['speed']}")
@@ -70,23 +121,22 @@ class MockAI:
                 "attacking_type": data1['types'][0],
                 "defending_type": data2['types'][0]
             })
-            type_data = json.loads(type_result)
+            type_data = _loads(type_result)
             print(f"🤖 AI: {type_data['effect']}")
         
         # Actually simulate the battle
         print(f"🤖 AI: Let me simulate this battle to be sure...")
-        battle_result = await self.server.call_tool("simulate_battle", {
-            "pokemon1": pokemon1,
-            "pokemon2": pokemon2
-        })
-        battle_data = json.loads(battle_result)
+        battle_result = await battle_task
+        battle_data = _loads(battle_result)
         
         if "error" not in battle_data:
             winner = battle_data['battle_result']['winner']
             turns = battle_data['battle_result']['total_turns']
             
-            response = f"🏆 Based on my simulation, {winner} would win after {turns} turns! "
-            response += f"The battle was {'quick' if turns <= 3 else 'intense' if turns <= 10 else 'epic'}."
+            response = " ".join([
+                f"🏆 Based on my simulation, {winner} would win after {turns} turns!",
+                f"The battle was {'quick' if turns <= 3 else 'intense' if turns <= 10 else 'epic'}."
+            ])
         else:
             response = "❌ I couldn't simulate the battle."
         
@@ -98,37 +148,25 @@ class MockAI:
         """AI recommends a Pokemon for the team"""
         print(f"🤖 AI: You have {', '.join(existing_team)} on your team. Let me recommend another Pokemon.")
         
-        # Analyze existing team
-        team_types = set()
-        for pokemon_name in existing_team:
-            result = await self.server.call_tool("get_pokemon", {"name_or_id": pokemon_name})
-            data = json.loads(result)
-            if "error" not in data:
-                team_types.update(data['types'])
+        # Analyze existing team (look up every member at the same time)
+        results = await asyncio.gather(*(
+            self._get_pokemon_cached(pokemon_name) for pokemon_name in existing_team
+        ))
+        team_types = set(itertools.chain.from_iterable(data['types'] for data in results if "error" not in data))
         
         print(f"🤖 AI: Your team currently has these types: {', '.join(team_types)}")
         
-        # Simple recommendation logic
-        if "water" not in team_types:
-            recommendation = "squirtle"
-            reason = "You need a Water-type for type coverage"
-        elif "fire" not in team_types:
-            recommendation = "charmander"
-            reason = "A Fire-type would balance your team"
-        elif "grass" not in team_types:
-            recommendation = "bulbasaur"
-            reason = "A Grass-type would complete the starter trio"
-        else:
-            recommendation = "snorlax"
-            reason = "A high HP Pokemon for defense"
+        # Simple recommendation logic - first type the team is missing
+        _, recommendation, reason = next(rec for rec in _RECS if rec[0] is None or rec[0] not in team_types)
         
         # Get info about the recommendation
-        result = await self.server.call_tool("get_pokemon", {"name_or_id": recommendation})
-        data = json.loads(result)
+        data = await self._get_pokemon_cached(recommendation)
         
         if "error" not in data:
-            response = f"💡 I recommend {data['name']}! {reason}. "
-            response += f"It's a {'/'.join(data['types'])} type with {data['stats']['hp']} HP and {data['stats']['attack']} Attack."
+            response = " ".join([
+                f"💡 I recommend {data['name']}! {reason}.",
+                f"It's a {'/'.join(data['types'])} type with {data['stats']['hp']} HP and {data['stats']['attack']} Attack."
+            ])
         else:
             response = f"💡 I recommend {recommendation}! {reason}."
         
@@ -164,12 +202,14 @@ async def demo_ai_conversation():
     # AI breaks down the complex query
     print("🤖 AI: Let me analyze both Pokemon for you...")
     
-    # Get both Pokemon
-    alakazam_result = await server.call_tool("get_pokemon", {"name_or_id": "alakazam"})
-    machamp_result = await server.call_tool("get_pokemon", {"name_or_id": "machamp"})
+    # Get both Pokemon at the same time
+    alakazam_result, machamp_result = await asyncio.gather(
+        server.call_tool("get_pokemon", {"name_or_id": "alakazam"}),
+        server.call_tool("get_pokemon", {"name_or_id": "machamp"})
+    )
     
-    alakazam_data = json.loads(alakazam_result)
-    machamp_data = json.loads(machamp_result)
+    alakazam_data = _loads(alakazam_result)
+    machamp_data = _loads(machamp_result)
     
     if "error" not in alakazam_data and "error" not in machamp_data:
         print(f"🤖 AI: Alakazam is a {'/'.join(alakazam_data['types'])} type with high Special Attack ({alakazam_data['stats']['special_attack']}) and Speed ({alakazam_data['stats']['speed']})")
@@ -180,7 +220,7 @@ async def demo_ai_conversation():
             "attacking_type": "psychic",
             "defending_type": "fighting"
         })
-        type_data = json.loads(type_result)
+        type_data = _loads(type_result)
         
         print(f"🤖 AI: Interesting! {type_data['effect']} - Psychic moves are super effective against Fighting types!")
         print("🤖 AI: Based on stats and type advantage, Alakazam would be better if you need speed and special attacks, while Machamp is better for physical power and durability.")
@@ -203,11 +243,11 @@ async def demo_resource_access():
     # Read a resource
     print("\nReading Pokemon database resource:")
     db_info = await server.read_resource("pokemon://database")
-    data = json.loads(db_info)
+    data = _loads(db_info)
     print(f"Database: {data['name']}")
     print(f"Capabilities: {len(data['capabilities'])} features available")
 
-async def main():
+async def run_examples():
     """Run the MCP client demo"""
     try:
         await demo_ai_conversation()
@@ -220,5 +260,9 @@ async def main():
         print(f"Demo failed: {e}")
         print("Make sure the Pokemon API is accessible and your internet connection is working.")
 
+def cli_main():
+    """Run the examples once from the command line"""
+    asyncio.run(run_examples())
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    cli_main()
\ No newline at end of file
@@ -4,13 +4,15 @@ __description__ = "Pokemon MCP Server for AI model integration"
 
 # Export main components
 from .pokemon_data import get_pokemon, pokemon_fetcher
-from .battle_simulator import simulate_pokemon_battle, battle_simulator
-from .models import Pokemon, BattlePokemon, BattleResult, BattleLog, Stats, Move, PokemonType
+from .battle_simulator import simulate_pokemon_battle, simulate_pokemon_battle_cached, simulate_pokemon_battles, battle_simulator
+from .models import Pokemon, BattlePokemon, BattleResult, BattleLog, Stats, Move, PokemonType, Status
 
 __all__ = [
     'get_pokemon', 
     'pokemon_fetcher',
     'simulate_pokemon_battle',
+    'simulate_pokemon_battle_cached',
+    'simulate_pokemon_battles',
     'battle_simulator',
     'Pokemon',
     'BattlePokemon', 
@@ -18,5 +20,6 @@ __all__ = [
     'BattleLog',
     'Stats',
     'Move',
-    'PokemonType'
+    'PokemonType',
+    'Status'
 ]
\ No newline at end of file
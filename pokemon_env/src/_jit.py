@@ -0,0 +1,13 @@
+"""
+Optional Numba support
+If Numba is installed the battle math gets compiled, otherwise it runs as plain Python
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that hands the function back unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
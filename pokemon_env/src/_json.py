@@ -0,0 +1,23 @@
+"""
+JSON helpers
+Uses orjson when it's installed (much faster), otherwise the standard json module
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Parse JSON from bytes or a string"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, pretty: bool = False) -> str:
+    """Turn an object into a JSON string (indented by 2 spaces if pretty)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
@@ -1,37 +1,76 @@
-import random
 import asyncio
-from typing import Tuple, List
-from .models import Pokemon, BattlePokemon, BattleResult, BattleLog, PokemonType
+import io
+import sys
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple, List
+from .models import Pokemon, BattlePokemon, BattleResult, BattleLog, PokemonType, Status
 from .pokemon_data import get_pokemon
+from ._jit import njit
+from .type_chart import TYPE_CHART, TYPE_INDEX, dual_type_effectiveness
+
+# How many random numbers to draw from NumPy at a time
+_RAND_POOL_SIZE = 512
+
+# Status conditions an attack can inflict
+_STATUSES = (Status.BURN, Status.POISON, Status.PARALYSIS)
+
+# How the status is described in the play-by-play
+_STATUS_MESSAGES = {Status.BURN: "burned", Status.POISON: "poisoned", Status.PARALYSIS: "paralyzed"}
+
+# Statuses that hurt every turn: the Pokemon loses 1/N of its max HP
+_STATUS_DIV = {Status.BURN: 16, Status.POISON: 8}
+
+@njit(cache=True)
+def _actual_stat(base_stat, level):
+    """Actual stat value at a given level"""
+    return int((2 * base_stat * level) / 100) + 5
+
+@njit(cache=True)
+def _damage_kernel(level, attack_stat, defense_stat, effectiveness, r1, r2):
+    """
+    Damage formula (simplified Pokemon formula)
+    r1 and r2 are random numbers in [0, 1): r1 rolls the 85%-100% damage range,
+    r2 rolls the 6.25% critical hit chance
+    Returns (damage, critical_hit)
+    """
+    base_damage = ((2 * level + 10) / 250) * (attack_stat / defense_stat) * 80 + 2
+    base_damage *= effectiveness
+    critical_hit = r2 < 0.0625
+    # Shifting left by 1 doubles the damage on a critical hit, by 0 leaves it alone
+    damage = int(base_damage * (0.85 + 0.15 * r1)) << int(critical_hit)
+    return damage, critical_hit
+
+# Compile once at import so the first battle doesn't pay for it
+_actual_stat(100, 50)
+_damage_kernel(50, 100, 100, 1.0, 0.5, 0.5)
 
 class BattleSimulator:
     """Simulates Pokemon battles - like a virtual battle arena"""
     
     def __init__(self):
-        # Type effectiveness chart - which types are strong against which
-        # 2.0 = super effective, 0.5 = not very effective, 0.0 = no effect
-        self.type_effectiveness = {
-            PokemonType.FIRE: {
-                PokemonType.GRASS: 2.0, PokemonType.ICE: 2.0, PokemonType.BUG: 2.0, PokemonType.STEEL: 2.0,
-                PokemonType.FIRE: 0.5, PokemonType.WATER: 0.5, PokemonType.ROCK: 0.5, PokemonType.DRAGON: 0.5
-            },
-            PokemonType.WATER: {
-                PokemonType.FIRE: 2.0, PokemonType.GROUND: 2.0, PokemonType.ROCK: 2.0,
-                PokemonType.WATER: 0.5, PokemonType.GRASS: 0.5, PokemonType.DRAGON: 0.5
-            },
-            PokemonType.ELECTRIC: {
-                PokemonType.WATER: 2.0, PokemonType.FLYING: 2.0,
-                PokemonType.ELECTRIC: 0.5, PokemonType.GRASS: 0.5, PokemonType.DRAGON: 0.5,
-                PokemonType.GROUND: 0.0
-            },
-            PokemonType.GRASS: {
-                PokemonType.WATER: 2.0, PokemonType.GROUND: 2.0, PokemonType.ROCK: 2.0,
-                PokemonType.FIRE: 0.5, PokemonType.GRASS: 0.5, PokemonType.POISON: 0.5, PokemonType.FLYING: 0.5, PokemonType.BUG: 0.5, PokemonType.DRAGON: 0.5, PokemonType.STEEL: 0.5
-            },
-            # Add more type matchups as needed...
-        }
+        # Random numbers are drawn from NumPy in blocks and handed out one at a time
+        self._rng = np.random.default_rng()
+        self._battle_rng = self._rng  # Generator for the battle currently running
+        self._refill_rand_pool()
+        
+        # Play-by-play buffer for the battle currently running (None = quiet)
+        self._out = None
+        self._critical_hits = 0
+    
+    def _refill_rand_pool(self):
+        """Draw a fresh block of random numbers"""
+        self._rand_pool = self._battle_rng.random(_RAND_POOL_SIZE).tolist()
+        self._rand_i = 0
+    
+    def _rand(self) -> float:
+        """Next random number in [0, 1) from the pool"""
+        if self._rand_i == _RAND_POOL_SIZE:
+            self._refill_rand_pool()
+        value = self._rand_pool[self._rand_i]
+        self._rand_i += 1
+        return value
     
-    async def simulate_battle(self, pokemon1_name: str, pokemon2_name: str, level1: int = 50, level2: int = 50) -> BattleResult:
+    async def simulate_battle(self, pokemon1_name: str, pokemon2_name: str, level1: int = 50, level2: int = 50, verbose: bool = False, seed: Optional[int] = None) -> BattleResult:
         """
         Simulate a battle between two Pokemon
         
@@ -40,6 +79,8 @@ class BattleSimulator:
             pokemon2_name: Name of second Pokemon
             level1: Level of first Pokemon (default 50)
             level2: Level of second Pokemon (default 50)
+            verbose: Print a play-by-play of the battle when it ends (default False)
+            seed: Random seed - the same seed always gives the same battle (default random)
             
         Returns:
             BattleResult with winner, turns, and detailed log
@@ -55,68 +96,64 @@ class BattleSimulator:
         # Create battle-ready Pokemon
         pokemon1 = BattlePokemon(pokemon=pokemon1_data, level=level1, current_hp=pokemon1_data.stats.hp)
         pokemon2 = BattlePokemon(pokemon=pokemon2_data, level=level2, current_hp=pokemon2_data.stats.hp)
+        self._prepare_battle_stats(pokemon1)
+        self._prepare_battle_stats(pokemon2)
+        
+        # Fresh random numbers for this battle
+        self._battle_rng = np.random.default_rng(seed) if seed is not None else self._rng
+        self._refill_rand_pool()
+        
+        # The play-by-play is collected here and printed in one go at the end
+        self._out = io.StringIO() if verbose else None
+        self._critical_hits = 0
+        
+        # Each action is recorded as a plain tuple:
+        # (turn, attacker, defender, damage, attacker_hp, defender_hp)
+        log_entries: List[Tuple[int, str, str, int, int, int]] = []
         
-        # Initialize battle log
-        battle_log: List[BattleLog] = []
-        turn = 1
+        if verbose:
+            self._say(f"⚔️ BATTLE START! {pokemon1.pokemon.name} vs {pokemon2.pokemon.name}")
+            self._say(f"{pokemon1.pokemon.name} HP: {pokemon1.current_hp}")
+            self._say(f"{pokemon2.pokemon.name} HP: {pokemon2.current_hp}")
+            self._say("=" * 50)
         
-        print(f"⚔️ BATTLE START! {pokemon1.pokemon.name} vs {pokemon2.pokemon.name}")
-        print(f"{pokemon1.pokemon.name} HP: {pokemon1.current_hp}")
-        print(f"{pokemon2.pokemon.name} HP: {pokemon2.current_hp}")
-        print("=" * 50)
+        # Local names for what the loop calls every turn (skips the attribute lookups)
+        determine_turn_order = self._determine_turn_order
+        perform_attack = self._perform_attack
+        apply_status_effects = self._apply_status_effects
+        record = log_entries.append
         
-        # Battle loop - continues until one Pokemon faints
-        while pokemon1.current_hp > 0 and pokemon2.current_hp > 0:
+        # Battle loop - ends as soon as a Pokemon faints, or in a draw after 50 turns
+        turn = 0
+        for turn in range(1, 51):
             
             # Determine turn order based on speed
-            first, second = self._determine_turn_order(pokemon1, pokemon2)
+            first, second = determine_turn_order(pokemon1, pokemon2)
             
             # First Pokemon attacks
-            if first.current_hp > 0:
-                damage = self._perform_attack(first, second)
-                log_entry = BattleLog(
-                    turn=turn,
-                    attacker=first.pokemon.name,
-                    defender=second.pokemon.name,
-                    move_used="Tackle",  # Simplified - using basic move
-                    damage_dealt=damage,
-                    message=f"{first.pokemon.name} attacks {second.pokemon.name} for {damage} damage!",
-                    attacker_hp=first.current_hp,
-                    defender_hp=second.current_hp
-                )
-                battle_log.append(log_entry)
-                print(f"Turn {turn}: {log_entry.message}")
-                
-                # Apply status effects
-                self._apply_status_effects(first)
-                self._apply_status_effects(second)
-            
-            # Second Pokemon attacks (if still alive)
-            if second.current_hp > 0 and first.current_hp > 0:
-                damage = self._perform_attack(second, first)
-                log_entry = BattleLog(
-                    turn=turn,
-                    attacker=second.pokemon.name,
-                    defender=first.pokemon.name,
-                    move_used="Tackle",  # Simplified - using basic move
-                    damage_dealt=damage,
-                    message=f"{second.pokemon.name} attacks {first.pokemon.name} for {damage} damage!",
-                    attacker_hp=second.current_hp,
-                    defender_hp=first.current_hp
-                )
-                battle_log.append(log_entry)
-                print(f"Turn {turn}: {log_entry.message}")
-                
-                # Apply status effects
-                self._apply_status_effects(first)
-                self._apply_status_effects(second)
+            damage = perform_attack(first, second)
+            record((turn, first.pokemon.name, second.pokemon.name, damage, first.current_hp, second.current_hp))
+            if verbose:
+                self._say(f"Turn {turn}: {first.pokemon.name} attacks {second.pokemon.name} for {damage} damage!")
+            if second.current_hp <= 0:
+                break
             
-            turn += 1
+            # Second Pokemon strikes back
+            damage = perform_attack(second, first)
+            record((turn, second.pokemon.name, first.pokemon.name, damage, second.current_hp, first.current_hp))
+            if verbose:
+                self._say(f"Turn {turn}: {second.pokemon.name} attacks {first.pokemon.name} for {damage} damage!")
+            if first.current_hp <= 0:
+                break
             
-            # Safety check to prevent infinite battles
-            if turn > 50:
-                print("Battle ended in a draw after 50 turns!")
+            # Apply status effects once at the end of the turn
+            apply_status_effects(first)
+            apply_status_effects(second)
+            if first.current_hp <= 0 or second.current_hp <= 0:
                 break
+        else:
+            if verbose:
+                self._say("Battle ended in a draw after 50 turns!")
         
         # Determine winner
         if pokemon1.current_hp <= 0:
@@ -129,20 +166,143 @@ class BattleSimulator:
             winner = "Draw"
             loser = "Draw"
         
-        print("=" * 50)
-        print(f"🏆 BATTLE END! Winner: {winner}")
+        if verbose:
+            self._say("=" * 50)
+            self._say(f"🏆 BATTLE END! Winner: {winner}")
+            self._say(f"Critical hits: {self._critical_hits}")
+            sys.stdout.write(self._out.getvalue())
+            self._out = None
+        
+        # Build the full battle log once the battle is over
+        battle_log = [
+            BattleLog(
+                turn=log_turn,
+                attacker=attacker,
+                defender=defender,
+                move_used="Tackle",  # Simplified - using basic move
+                damage_dealt=damage,
+                message=f"{attacker} attacks {defender} for {damage} damage!",
+                attacker_hp=attacker_hp,
+                defender_hp=defender_hp
+            ) for log_turn, attacker, defender, damage, attacker_hp, defender_hp in log_entries
+        ]
         
         return BattleResult(
             winner=winner,
             loser=loser,
-            total_turns=turn - 1,
+            total_turns=turn,
             battle_log=battle_log
         )
     
+    def _say(self, message: str):
+        """Add a line to the play-by-play (only collected when the battle is verbose)"""
+        if self._out is not None:
+            self._out.write(message + "\n")
+    
+    async def simulate_battles_batch(self, pairs: List[Tuple[str, str]], level: int = 50) -> List[BattleResult]:
+        """
+        Simulate many battles at once with NumPy arrays
+        
+        Every battle is one slot in the arrays, so each turn is a handful of
+        array operations no matter how many battles are running. Good for
+        win-rate tables where you need lots of results, not detailed logs.
+        Status effects are not simulated and battle_log is left empty.
+        
+        Args:
+            pairs: List of (pokemon1_name, pokemon2_name) matchups
+            level: Level of every Pokemon (default 50)
+            
+        Returns:
+            One BattleResult per pair, in the same order
+        """
+        if not pairs:
+            return []
+        
+        # Fetch every Pokemon we need once, all at the same time
+        names = list(dict.fromkeys(name for pair in pairs for name in pair))
+        fetched = await asyncio.gather(*(get_pokemon(name) for name in names))
+        if any(pokemon is None for pokemon in fetched):
+            raise ValueError("One or more Pokemon not found!")
+        roster = dict(zip(names, fetched))
+        side1 = [roster[name1] for name1, _ in pairs]
+        side2 = [roster[name2] for _, name2 in pairs]
+        
+        def actual_stats(side: List[Pokemon], stat: str) -> np.ndarray:
+            base = np.array([getattr(pokemon.stats, stat) for pokemon in side], dtype=np.int64)
+            return (2 * base * level) // 100 + 5
+        
+        def first_types(side: List[Pokemon]) -> np.ndarray:
+            return np.array([TYPE_INDEX[pokemon.types[0] if pokemon.types else PokemonType.NORMAL] for pokemon in side])
+        
+        def type_multipliers(attack_types: np.ndarray, defenders: List[Pokemon]) -> np.ndarray:
+            # Every defending type counts - a second type multiplies in (single types multiply by 1)
+            multiplier = np.ones(len(defenders), dtype=np.float32)
+            for slot in range(2):
+                defend_types = np.array([TYPE_INDEX[p.types[slot]] if len(p.types) > slot else -1 for p in defenders])
+                has_type = defend_types >= 0
+                multiplier[has_type] *= TYPE_CHART[attack_types[has_type], defend_types[has_type]]
+            return multiplier
+        
+        battles = len(pairs)
+        hp1 = np.array([pokemon.stats.hp for pokemon in side1], dtype=np.int64)
+        hp2 = np.array([pokemon.stats.hp for pokemon in side2], dtype=np.int64)
+        speed1 = actual_stats(side1, "speed")
+        speed2 = actual_stats(side2, "speed")
+        
+        # Everything except the random rolls stays the same for the whole battle
+        types1 = first_types(side1)
+        types2 = first_types(side2)
+        level_factor = (2 * level + 10) / 250
+        base_damage1 = (level_factor * (actual_stats(side1, "attack") / actual_stats(side2, "defense")) * 80 + 2) * type_multipliers(types1, side2)
+        base_damage2 = (level_factor * (actual_stats(side2, "attack") / actual_stats(side1, "defense")) * 80 + 2) * type_multipliers(types2, side1)
+        
+        total_turns = np.zeros(battles, dtype=np.int64)
+        for turn in range(1, 51):
+            active = (hp1 > 0) & (hp2 > 0)
+            if not active.any():
+                break
+            total_turns[active] = turn
+            
+            # Faster Pokemon goes first, ties are random
+            one_first = (speed1 > speed2) | ((speed1 == speed2) & (self._rng.random(battles) < 0.5))
+            
+            # Damage rolls (85%-100%) and critical hits (6.25% for 2x)
+            damage1 = (base_damage1 * self._rng.uniform(0.85, 1.0, battles)).astype(np.int64)
+            damage2 = (base_damage2 * self._rng.uniform(0.85, 1.0, battles)).astype(np.int64)
+            damage1 <<= (self._rng.random(battles) < 0.0625).astype(np.int64)
+            damage2 <<= (self._rng.random(battles) < 0.0625).astype(np.int64)
+            
+            # First attacker swings
+            hp2 -= np.where(active & one_first, damage1, 0)
+            hp1 -= np.where(active & ~one_first, damage2, 0)
+            
+            # Second attacker swings back if both are still standing
+            still_active = active & (hp1 > 0) & (hp2 > 0)
+            hp1 -= np.where(still_active & one_first, damage2, 0)
+            hp2 -= np.where(still_active & ~one_first, damage1, 0)
+        
+        results = []
+        for i in range(battles):
+            name1, name2 = side1[i].name, side2[i].name
+            if hp1[i] <= 0:
+                winner, loser = name2, name1
+            elif hp2[i] <= 0:
+                winner, loser = name1, name2
+            else:
+                winner = loser = "Draw"
+            results.append(BattleResult(winner=winner, loser=loser, total_turns=int(total_turns[i]), battle_log=[]))
+        return results
+    
+    def _prepare_battle_stats(self, pokemon: BattlePokemon):
+        """Work out the actual battle stats once - they don't change during a battle"""
+        pokemon._eff_speed = self._calculate_actual_stat(pokemon.pokemon.stats.speed, pokemon.level)
+        pokemon._eff_attack = self._calculate_actual_stat(pokemon.pokemon.stats.attack, pokemon.level)
+        pokemon._eff_defense = self._calculate_actual_stat(pokemon.pokemon.stats.defense, pokemon.level)
+    
     def _determine_turn_order(self, pokemon1: BattlePokemon, pokemon2: BattlePokemon) -> Tuple[BattlePokemon, BattlePokemon]:
         """Determine which Pokemon goes first based on speed"""
-        speed1 = self._calculate_actual_stat(pokemon1.pokemon.stats.speed, pokemon1.level)
-        speed2 = self._calculate_actual_stat(pokemon2.pokemon.stats.speed, pokemon2.level)
+        speed1 = pokemon1._eff_speed
+        speed2 = pokemon2._eff_speed
         
         if speed1 > speed2:
             return pokemon1, pokemon2
@@ -150,38 +310,31 @@ class BattleSimulator:
             return pokemon2, pokemon1
         else:
             # If speeds are equal, choose randomly
-            return (pokemon1, pokemon2) if random.random() < 0.5 else (pokemon2, pokemon1)
+            return (pokemon1, pokemon2) if self._rand() < 0.5 else (pokemon2, pokemon1)
     
     def _perform_attack(self, attacker: BattlePokemon, defender: BattlePokemon) -> int:
         """Calculate and apply attack damage"""
         
         # Check if Pokemon can attack (paralysis might prevent it)
-        if attacker.status == "paralysis" and random.random() < 0.25:
-            print(f"{attacker.pokemon.name} is paralyzed and can't move!")
+        if attacker.status & Status.PARALYSIS and self._rand() < 0.25:
+            self._say(f"{attacker.pokemon.name} is paralyzed and can't move!")
             return 0
         
         # Simplified damage calculation
-        attack_stat = self._calculate_actual_stat(attacker.pokemon.stats.attack, attacker.level)
-        defense_stat = self._calculate_actual_stat(defender.pokemon.stats.defense, defender.level)
+        attack_stat = attacker._eff_attack
+        defense_stat = defender._eff_defense
         
-        # Base damage calculation (simplified Pokemon formula)
-        base_damage = ((2 * attacker.level + 10) / 250) * (attack_stat / defense_stat) * 80 + 2
-        
-        # Type effectiveness (simplified - just check first types)
+        # Type effectiveness (attacks use the attacker's first type, and both of the defender's types count)
         effectiveness = self._get_type_effectiveness(
             attacker.pokemon.types[0] if attacker.pokemon.types else PokemonType.NORMAL,
-            defender.pokemon.types[0] if defender.pokemon.types else PokemonType.NORMAL
+            defender.pokemon.types or (PokemonType.NORMAL,)
         )
         
-        base_damage *= effectiveness
-        
-        # Add some randomness (85% to 100% of calculated damage)
-        damage = int(base_damage * random.uniform(0.85, 1.0))
-        
-        # Critical hit chance (6.25% chance for 2x damage)
-        if random.random() < 0.0625:
-            damage *= 2
-            print(f"Critical hit!")
+        # Damage with some randomness (85% to 100%) and a 6.25% chance for a 2x critical hit
+        damage, critical_hit = _damage_kernel(
+            attacker.level, attack_stat, defense_stat, effectiveness, self._rand(), self._rand()
+        )
+        self._critical_hits += critical_hit
         
         # Apply damage
         defender.current_hp = max(0, defender.current_hp - damage)
@@ -193,41 +346,48 @@ class BattleSimulator:
     
     def _calculate_actual_stat(self, base_stat: int, level: int) -> int:
         """Calculate actual stat value based on level"""
-        return int((2 * base_stat * level) / 100) + 5
+        return _actual_stat(base_stat, level)
     
-    def _get_type_effectiveness(self, attack_type: PokemonType, defend_type: PokemonType) -> float:
-        """Get type effectiveness multiplier"""
-        if attack_type in self.type_effectiveness:
-            return self.type_effectiveness[attack_type].get(defend_type, 1.0)
-        return 1.0
+    def _get_type_effectiveness(self, attack_type: PokemonType, defend_types: Sequence[PokemonType]) -> float:
+        """Get type effectiveness multiplier against all of the defender's types"""
+        return dual_type_effectiveness(attack_type, defend_types)
     
     def _maybe_inflict_status(self, attacker: BattlePokemon, defender: BattlePokemon):
         """Maybe inflict a status condition"""
-        if defender.status is None and random.random() < 0.1:  # 10% chance
-            possible_statuses = ["burn", "poison", "paralysis"]
-            status = random.choice(possible_statuses)
+        if not defender.status and self._rand() < 0.1:  # 10% chance
+            status = _STATUSES[int(self._rand() * len(_STATUSES))]
             defender.status = status
-            print(f"{defender.pokemon.name} is now {status}ed!")
+            self._say(f"{defender.pokemon.name} is now {_STATUS_MESSAGES[status]}!")
     
     def _apply_status_effects(self, pokemon: BattlePokemon):
         """Apply ongoing status effects"""
-        if pokemon.status == "burn":
-            damage = max(1, pokemon.pokemon.stats.hp // 16)
-            pokemon.current_hp = max(0, pokemon.current_hp - damage)
-            print(f"{pokemon.pokemon.name} takes {damage} burn damage!")
-        
-        elif pokemon.status == "poison":
-            damage = max(1, pokemon.pokemon.stats.hp // 8)
+        divisor = _STATUS_DIV.get(pokemon.status)
+        if divisor:
+            damage = max(1, pokemon.pokemon.stats.hp // divisor)
             pokemon.current_hp = max(0, pokemon.current_hp - damage)
-            print(f"{pokemon.pokemon.name} takes {damage} poison damage!")
+            self._say(f"{pokemon.pokemon.name} takes {damage} {pokemon.status.name.lower()} damage!")
 
 # Create global battle simulator instance
 battle_simulator = BattleSimulator()
 
 # Helper function for easy use
-async def simulate_pokemon_battle(pokemon1: str, pokemon2: str) -> BattleResult:
+async def simulate_pokemon_battle(pokemon1: str, pokemon2: str, verbose: bool = False) -> BattleResult:
     """Easy way to simulate a battle"""
-    return await battle_simulator.simulate_battle(pokemon1, pokemon2)
+    return await battle_simulator.simulate_battle(pokemon1, pokemon2, verbose=verbose)
+
+# Battles already simulated with a fixed seed: (pokemon1, pokemon2, seed) -> result
+_BATTLE_CACHE: Dict[Tuple[str, str, int], BattleResult] = {}
+
+async def simulate_pokemon_battle_cached(pokemon1: str, pokemon2: str, seed: int = 0) -> BattleResult:
+    """Easy way to simulate a repeatable battle - the same matchup and seed is only simulated once"""
+    cache_key = (pokemon1.lower(), pokemon2.lower(), seed)
+    if cache_key not in _BATTLE_CACHE:
+        _BATTLE_CACHE[cache_key] = await battle_simulator.simulate_battle(pokemon1, pokemon2, seed=seed)
+    return _BATTLE_CACHE[cache_key]
+
+async def simulate_pokemon_battles(pairs: List[Tuple[str, str]]) -> List[BattleResult]:
+    """Easy way to simulate lots of battles at once"""
+    return await battle_simulator.simulate_battles_batch(pairs)
 
 # Test function
 async def test_battle():
@@ -235,7 +395,7 @@ async def test_battle():
     print("Testing Battle Simulator...")
     
     try:
-        result = await simulate_pokemon_battle("pikachu", "charmander")
+        result = await simulate_pokemon_battle("pikachu", "charmander", verbose=True)
         print(f"\nBattle completed!")
         print(f"Winner: {result.winner}")
         print(f"Total turns: {result.total_turns}")
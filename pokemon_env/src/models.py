@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
+from typing import Any, List, Optional, Dict, Tuple
+from enum import Enum, IntFlag
+from ._jit import njit
 
 class PokemonType(str, Enum):
     """Pokemon types - like Fire, Water, etc."""
@@ -23,8 +24,28 @@ class PokemonType(str, Enum):
     STEEL = "steel"
     FAIRY = "fairy"
 
+class Status(IntFlag):
+    """Status conditions as bit flags - NONE (0) means healthy"""
+    NONE = 0
+    BURN = 1
+    POISON = 2
+    PARALYSIS = 4
+
+# Data that never changes once it's made is frozen, so one copy can safely be
+# shared by the caches and every battle that uses it
+_FROZEN = ConfigDict(frozen=True, extra="forbid")
+
+# Only used when a BattlePokemon is made without current_hp, so it's compiled
+# the first time that happens rather than whenever the models are imported
+@njit(cache=True)
+def _calc_actual_hp(base_hp, level):
+    """HP at a given level (simplified formula)"""
+    return int((2 * base_hp * level) / 100) + level + 10
+
 class Stats(BaseModel):
     """Pokemon's battle statistics"""
+    model_config = _FROZEN
+    
     hp: int          # Health Points - how much damage it can take
     attack: int      # Physical attack power
     defense: int     # Physical defense
@@ -34,6 +55,8 @@ class Stats(BaseModel):
 
 class Move(BaseModel):
     """A Pokemon's attack move"""
+    model_config = _FROZEN
+    
     name: str
     type: PokemonType
     power: int       # How much damage it does
@@ -42,6 +65,8 @@ class Move(BaseModel):
 
 class Pokemon(BaseModel):
     """Complete Pokemon information"""
+    model_config = _FROZEN
+    
     id: int
     name: str
     types: List[PokemonType]  # Pokemon can have 1 or 2 types
@@ -51,26 +76,52 @@ class Pokemon(BaseModel):
     height: float    # in meters
     weight: float    # in kilograms
     
+    # Type names as plain strings and stats as a plain dict, worked out once when the Pokemon is created
+    _type_values: Tuple[str, ...] = PrivateAttr(default=())
+    _stats_dict: Dict[str, int] = PrivateAttr(default_factory=dict)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._type_values = tuple(t.value for t in self.types)
+        self._stats_dict = {name: getattr(self.stats, name) for name in Stats.model_fields}
+    
+    @property
+    def type_values(self) -> Tuple[str, ...]:
+        """Type names like ("fire", "flying")"""
+        return self._type_values
+    
+    @property
+    def stats_dict(self) -> Dict[str, int]:
+        """Stats like {"hp": 35, "attack": 55, ...} - treat it as read-only"""
+        return self._stats_dict
+    
 class BattlePokemon(BaseModel):
-    """Pokemon ready for battle with current status"""
+    """Pokemon ready for battle with current status (not frozen - HP and status change as it fights)"""
     pokemon: Pokemon
     level: int = 50
-    current_hp: int
-    status: Optional[str] = None  # "burn", "poison", "paralysis", etc.
+    current_hp: Optional[int] = None  # Worked out from the level if not given
+    status: Status = Status.NONE  # Burn, poison, paralysis, etc.
     
-    def __init__(self, **data):
-        super().__init__(**data)
+    # Actual stats at this level - they don't change during a battle,
+    # so the battle simulator works them out once up front
+    _eff_speed: int = PrivateAttr(default=0)
+    _eff_attack: int = PrivateAttr(default=0)
+    _eff_defense: int = PrivateAttr(default=0)
+    
+    @model_validator(mode="after")
+    def _fill_current_hp(self) -> "BattlePokemon":
         # Calculate actual HP based on level
-        if 'current_hp' not in data:
+        if self.current_hp is None:
             self.current_hp = self.calculate_actual_hp()
+        return self
     
     def calculate_actual_hp(self) -> int:
         """Calculate HP based on level (simplified formula)"""
-        base_hp = self.pokemon.stats.hp
-        return int((2 * base_hp * self.level) / 100) + self.level + 10
+        return _calc_actual_hp(self.pokemon.stats.hp, self.level)
 
 class BattleLog(BaseModel):
     """Records what happens in battle"""
+    model_config = _FROZEN
+    
     turn: int
     attacker: str    # Pokemon name
     defender: str    # Pokemon name
@@ -82,6 +133,8 @@ class BattleLog(BaseModel):
 
 class BattleResult(BaseModel):
     """Final battle outcome"""
+    model_config = _FROZEN
+    
     winner: str
     loser: str
     total_turns: int
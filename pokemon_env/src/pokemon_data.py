@@ -1,14 +1,162 @@
 import httpx
 import asyncio
-from typing import Optional, Dict, Any
+import logging
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Iterable, Optional, Dict, Any, Tuple
 from .models import Pokemon, Stats, Move, PokemonType
+from . import _json
+
+# Problems are logged instead of printed, so a busy server isn't held up writing to the console.
+# Call logging.basicConfig(level=logging.DEBUG) to also see every fetch.
+logger = logging.getLogger(__name__)
+
+# Where Pokemon are saved between runs. Set POKEMON_CACHE_PATH to move it,
+# or set it to an empty value to turn the disk cache off.
+_DEFAULT_DISK_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pokemon-mcp-server", "pokemon.sqlite3")
+
+# How long a Pokemon saved on disk is trusted before we ask the API again (1 day)
+_DISK_CACHE_TTL = 24 * 60 * 60
+
+# PokeAPI's GraphQL endpoint lets us ask for only the fields we use, so replies are
+# much smaller than the REST ones. It's still in beta (and rate limited), so it's
+# opt-in: set POKEMON_USE_GRAPHQL=1 or pass use_graphql=True to switch it on.
+# There's one move row per game version and way of learning it, so moves are made
+# distinct (and ordered) by move ID - otherwise the first 10 rows repeat moves.
+_GRAPHQL_URL = "https://beta.pokeapi.co/graphql/v1beta"
+_GRAPHQL_FIELDS = """
+    id
+    name
+    height
+    weight
+    pokemon_v2_pokemontypes(order_by: {slot: asc}) { pokemon_v2_type { name } }
+    pokemon_v2_pokemonstats(order_by: {pokemon_v2_stat: {id: asc}}) { base_stat pokemon_v2_stat { name } }
+    pokemon_v2_pokemonabilities(order_by: {slot: asc}) { pokemon_v2_ability { name } }
+    pokemon_v2_pokemonmoves(distinct_on: move_id, order_by: {move_id: asc}, limit: 10) { pokemon_v2_move { name } }
+"""
+_GRAPHQL_QUERY_BY_NAME = "query ($name: String!) { pokemon_v2_pokemon(where: {name: {_eq: $name}}, limit: 1) {%s} }" % _GRAPHQL_FIELDS
+_GRAPHQL_QUERY_BY_ID = "query ($id: Int!) { pokemon_v2_pokemon(where: {id: {_eq: $id}}, limit: 1) {%s} }" % _GRAPHQL_FIELDS
+
+# Type names we understand - Enum already keeps this value -> member dict, so we borrow it
+# instead of going through the slower PokemonType(name) constructor
+_POKEMON_TYPE_BY_VALUE = PokemonType._value2member_map_
+
+# API stat names -> our stat names
+_STAT_NAME_MAP = {
+    "hp": "hp",
+    "attack": "attack",
+    "defense": "defense",
+    "special-attack": "special_attack",
+    "special-defense": "special_defense",
+    "speed": "speed"
+}
+
+# Display names we've already worked out ("static-shock" -> "Static Shock").
+# The same moves and abilities show up on lots of Pokemon, so they all share one string.
+# There are only a couple of thousand, but the table is emptied if it somehow grows past the cap.
+_DISPLAY_NAMES: Dict[str, str] = {}
+_DISPLAY_NAMES_CAP = 4096
+
+def _norm(api_name: str) -> str:
+    """Turn an API name like "static-shock" into "Static Shock", reusing earlier results"""
+    display_name = _DISPLAY_NAMES.get(api_name)
+    if display_name is None:
+        if len(_DISPLAY_NAMES) >= _DISPLAY_NAMES_CAP:
+            _DISPLAY_NAMES.clear()
+        display_name = _DISPLAY_NAMES[api_name] = sys.intern(api_name.replace("-", " ").title())
+    return display_name
 
 class PokemonDataFetcher:
     """Fetches Pokemon data from PokeAPI - like a Pokemon encyclopedia"""
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None, use_graphql: Optional[bool] = None):
         self.base_url = "https://pokeapi.co/api/v2"
-        self.cache: Dict[str, Pokemon] = {}  # Store Pokemon we've already looked up
+        self.graphql_url = _GRAPHQL_URL
+        if use_graphql is None:
+            use_graphql = os.environ.get("POKEMON_USE_GRAPHQL", "").lower() in ("1", "true", "yes")
+        self.use_graphql = use_graphql
+        # Store Pokemon we've already looked up, one entry per Pokemon under its ID -
+        # least recently used ones are dropped when it's full
+        self.cache: "OrderedDict[str, Pokemon]" = OrderedDict()
+        self._cache_cap = 512
+        
+        # Other spellings we've seen (like "pikachu") -> the ID key they belong to
+        self._aliases: Dict[str, str] = {}
+        
+        # Fetches that are still running, so two requests for the same Pokemon share one
+        self._inflight: Dict[str, "asyncio.Future[Optional[Pokemon]]"] = {}
+        
+        # Second cache level on disk, so Pokemon survive restarts
+        if cache_path is None:
+            cache_path = os.environ.get("POKEMON_CACHE_PATH", _DEFAULT_DISK_CACHE_PATH)
+        self._disk = self._open_disk_cache(cache_path) if cache_path else None
+        
+        # One HTTP client is kept open so connections to the API get reused.
+        # It belongs to the event loop it was created in, so it's made on first use.
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),  # Increased timeout for slow connections
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0)
+            )
+            self._client_loop = loop
+        return self._client
+    
+    def _open_disk_cache(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open (or create) the SQLite file that holds saved Pokemon"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS pokemon (key TEXT PRIMARY KEY, json BLOB, fetched_at REAL)")
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Disk cache disabled - could not open %s: %s", path, e)
+            return None
+    
+    def _disk_get(self, cache_key: str) -> Optional[Pokemon]:
+        """Load a saved Pokemon from disk, if we have a fresh enough copy"""
+        if self._disk is None:
+            return None
+        try:
+            row = self._disk.execute("SELECT json, fetched_at FROM pokemon WHERE key = ?", (cache_key,)).fetchone()
+            if row is None or time.time() - row[1] > _DISK_CACHE_TTL:
+                return None
+            return Pokemon.model_validate_json(row[0])
+        except (sqlite3.Error, ValueError):
+            # The disk cache is only a shortcut - if it's broken, just ask the API
+            return None
+    
+    def _disk_put(self, keys: Iterable[str], pokemon: Pokemon):
+        """Save a Pokemon to disk under each of the given keys"""
+        if self._disk is None:
+            return
+        blob = pokemon.model_dump_json().encode()
+        fetched_at = time.time()
+        try:
+            with self._disk:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO pokemon (key, json, fetched_at) VALUES (?, ?, ?)",
+                    [(key, blob, fetched_at) for key in keys]
+                )
+        except sqlite3.Error:
+            pass
+    
+    async def aclose(self):
+        """Close the shared HTTP client and its open connections"""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
         
     async def get_pokemon(self, name_or_id: str) -> Optional[Pokemon]:
         """
@@ -21,94 +169,201 @@ class PokemonDataFetcher:
             Pokemon object with all the data, or None if not found
         """
         # Check if we already have this Pokemon in our cache
-        cache_key = str(name_or_id).lower()
+        # (every spelling of a Pokemon we've seen before leads to the same entry)
+        requested = self._normalize_key(name_or_id)
+        cache_key = self._aliases.get(requested, requested)
         if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
             return self.cache[cache_key]
         
+        # Then check if we saved it on disk in an earlier run
+        pokemon = self._disk_get(cache_key)
+        if pokemon is not None:
+            self._cache_put(cache_key, pokemon)
+            return pokemon
+        
+        # If someone is already fetching this Pokemon, wait for their result instead of asking again
+        pending = self._inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_pokemon(name_or_id, cache_key))
+            self._inflight[cache_key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        # shield() so one caller giving up doesn't cancel the fetch for everyone else
+        return await asyncio.shield(pending)
+    
+    async def _fetch_pokemon(self, name_or_id: str, cache_key: str) -> Optional[Pokemon]:
+        """Fetch a Pokemon from the API and cache it"""
         try:
-            # Increased timeout for slow connections
-            timeout = httpx.Timeout(30.0)  # 30 seconds timeout
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                print(f"Fetching {name_or_id} from Pokemon API... (this may take a moment)")
-                
-                # Get basic Pokemon data
-                pokemon_response = await client.get(f"{self.base_url}/pokemon/{name_or_id}")
-                pokemon_response.raise_for_status()
-                pokemon_data = pokemon_response.json()
-                
-                # Get Pokemon species data (for more info)
-                species_response = await client.get(pokemon_data["species"]["url"])
-                species_response.raise_for_status()
-                species_data = species_response.json()
-                
-                # Convert the API data to our Pokemon model
-                pokemon = self._convert_api_data_to_pokemon(pokemon_data, species_data)
-                
-                # Save in cache for next time
-                self.cache[cache_key] = pokemon
-                print(f"✅ Successfully cached {pokemon.name}")
-                return pokemon
-                
+            client = self._get_client()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Fetching %s from Pokemon API", name_or_id)
+            
+            if self.use_graphql:
+                pokemon = await self._fetch_pokemon_graphql(client, cache_key)
+            else:
+                pokemon = await self._fetch_pokemon_rest(client, cache_key)
+            if pokemon is None:
+                logger.info("Pokemon %s not found", name_or_id)
+                return None
+            
+            # Save in cache (and on disk) for next time
+            self._cache_put(cache_key, pokemon)
+            self._disk_put(self._cache_keys(cache_key, pokemon), pokemon)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cached %s", pokemon.name)
+            return pokemon
+            
         except httpx.TimeoutException:
-            print(f"⏰ Timeout fetching Pokemon {name_or_id} - API is responding slowly")
+            logger.warning("Timeout fetching Pokemon %s - API is responding slowly", name_or_id, exc_info=True)
+            return None
+        except httpx.HTTPError:
+            logger.warning("Network error fetching Pokemon %s", name_or_id, exc_info=True)
             return None
-        except httpx.HTTPError as e:
-            print(f"🌐 Network error fetching Pokemon {name_or_id}: {e}")
+        except Exception:
+            logger.exception("Unexpected error fetching %s", name_or_id)
             return None
-        except Exception as e:
-            print(f"❌ Unexpected error fetching {name_or_id}: {e}")
+    
+    async def _fetch_pokemon_rest(self, client: httpx.AsyncClient, name_or_id: str) -> Optional[Pokemon]:
+        """Fetch a Pokemon from the REST API (the full Pokemon and species pages), or None if there's no such Pokemon"""
+        # Get basic Pokemon data and species data (for more info) at the same time.
+        # The species almost always has the same name/ID as the Pokemon, so we guess its URL.
+        pokemon_response, species_response = await asyncio.gather(
+            client.get(f"{self.base_url}/pokemon/{name_or_id}"),
+            client.get(f"{self.base_url}/pokemon-species/{name_or_id}"),
+            return_exceptions=True
+        )
+        if isinstance(pokemon_response, BaseException):
+            raise pokemon_response
+        if pokemon_response.status_code == 404:
             return None
+        pokemon_response.raise_for_status()
+        pokemon_data = _json.loads(pokemon_response.content)
+        
+        species_data = None
+        if not isinstance(species_response, BaseException) and species_response.status_code == 200:
+            species_data = _json.loads(species_response.content)
+        
+        # Guessed wrong (forms like "charizard-mega" belong to another species) - follow the real link
+        if species_data is None or species_data["name"] != pokemon_data["species"]["name"]:
+            species_response = await client.get(pokemon_data["species"]["url"])
+            species_response.raise_for_status()
+            species_data = _json.loads(species_response.content)
+        
+        # Convert the API data to our Pokemon model
+        return self._convert_api_data_to_pokemon(pokemon_data, species_data)
+    
+    async def _fetch_pokemon_graphql(self, client: httpx.AsyncClient, name_or_id: str) -> Optional[Pokemon]:
+        """Fetch just the fields we use with one GraphQL query, or None if there's no such Pokemon"""
+        name_or_id = str(name_or_id).lower()
+        if name_or_id.isdigit():
+            payload = {"query": _GRAPHQL_QUERY_BY_ID, "variables": {"id": int(name_or_id)}}
+        else:
+            payload = {"query": _GRAPHQL_QUERY_BY_NAME, "variables": {"name": name_or_id}}
+        
+        response = await client.post(self.graphql_url, content=_json.dumps(payload), headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        reply = _json.loads(response.content)
+        if reply.get("errors"):
+            raise ValueError(f"GraphQL error: {reply['errors'][0].get('message')}")
+        
+        results = reply["data"]["pokemon_v2_pokemon"]
+        if not results:
+            return None
+        return self._convert_graphql_data_to_pokemon(results[0])
+    
+    @staticmethod
+    def _normalize_key(name_or_id: Any) -> str:
+        """Turn "Pikachu", " pikachu ", 25 and "025" into the same few spellings"""
+        key = str(name_or_id).strip().lower().replace(" ", "-")
+        return str(int(key)) if key.isdigit() else key
+    
+    def _cache_keys(self, cache_key: str, pokemon: Pokemon) -> Iterable[str]:
+        """Keys a Pokemon is known by: the one it was asked for, plus its name and ID"""
+        return dict.fromkeys((cache_key, pokemon.name.lower(), str(pokemon.id)))
+    
+    def _cache_put(self, cache_key: str, pokemon: Pokemon):
+        """Cache a Pokemon once under its ID, and remember the other keys as aliases"""
+        canonical = str(pokemon.id)
+        for key in self._cache_keys(cache_key, pokemon):
+            if key != canonical:
+                self._aliases[key] = canonical
+        self.cache[canonical] = pokemon
+        self.cache.move_to_end(canonical)
+        while len(self.cache) > self._cache_cap:
+            self.cache.popitem(last=False)
     
     def _convert_api_data_to_pokemon(self, pokemon_data: Dict[str, Any], species_data: Dict[str, Any]) -> Pokemon:
         """
         Convert the messy API data into our clean Pokemon model
         Think of this as translating from Pokemon-speak to our language
         """
+        # Pull out the few lists we use once, then walk them without going back to pokemon_data.
+        # islice() reads the first 10 moves without copying the (often very long) move list.
+        types_list = pokemon_data["types"]
+        stats_list = pokemon_data["stats"]
+        abilities_list = pokemon_data["abilities"]
+        moves_list = pokemon_data["moves"]
+        return self._build_pokemon(
+            pokemon_id=pokemon_data["id"],
+            api_name=pokemon_data["name"],
+            type_names=(type_info["type"]["name"] for type_info in types_list),
+            base_stats=((stat["stat"]["name"], stat["base_stat"]) for stat in stats_list),
+            ability_names=(ability_info["ability"]["name"] for ability_info in abilities_list),
+            move_names=(move_info["move"]["name"] for move_info in islice(moves_list, 10)),
+            height=pokemon_data["height"],
+            weight=pokemon_data["weight"]
+        )
+    
+    def _convert_graphql_data_to_pokemon(self, pokemon_data: Dict[str, Any]) -> Pokemon:
+        """Same as _convert_api_data_to_pokemon, but for the shape the GraphQL API replies with"""
+        return self._build_pokemon(
+            pokemon_id=pokemon_data["id"],
+            api_name=pokemon_data["name"],
+            type_names=(t["pokemon_v2_type"]["name"] for t in pokemon_data["pokemon_v2_pokemontypes"]),
+            base_stats=((s["pokemon_v2_stat"]["name"], s["base_stat"]) for s in pokemon_data["pokemon_v2_pokemonstats"]),
+            ability_names=(a["pokemon_v2_ability"]["name"] for a in pokemon_data["pokemon_v2_pokemonabilities"]),
+            move_names=(m["pokemon_v2_move"]["name"] for m in islice(pokemon_data["pokemon_v2_pokemonmoves"], 10)),
+            height=pokemon_data["height"],
+            weight=pokemon_data["weight"]
+        )
+    
+    def _build_pokemon(self, pokemon_id: int, api_name: str, type_names: Iterable[str],
+                       base_stats: Iterable[Tuple[str, int]], ability_names: Iterable[str],
+                       move_names: Iterable[str], height: int, weight: int) -> Pokemon:
+        """Build our Pokemon model from the pieces both API shapes give us"""
         
         # Extract basic info
-        pokemon_id = pokemon_data["id"]
-        name = pokemon_data["name"].title()  # Make first letter uppercase
+        name = api_name.title()  # Make first letter uppercase
         
         # Extract types (Fire, Water, etc.)
         types = []
-        for type_info in pokemon_data["types"]:
-            type_name = type_info["type"]["name"]
-            if type_name in [t.value for t in PokemonType]:
-                types.append(PokemonType(type_name))
+        for type_name in type_names:
+            pokemon_type = _POKEMON_TYPE_BY_VALUE.get(type_name)
+            if pokemon_type is not None:
+                types.append(pokemon_type)
         
         # Extract stats (HP, Attack, etc.)
         stats_data = {}
-        for stat in pokemon_data["stats"]:
-            stat_name = stat["stat"]["name"]
-            base_value = stat["base_stat"]
-            
+        for api_stat_name, base_stat in base_stats:
             # Convert API stat names to our names
-            if stat_name == "hp":
-                stats_data["hp"] = base_value
-            elif stat_name == "attack":
-                stats_data["attack"] = base_value
-            elif stat_name == "defense":
-                stats_data["defense"] = base_value
-            elif stat_name == "special-attack":
-                stats_data["special_attack"] = base_value
-            elif stat_name == "special-defense":
-                stats_data["special_defense"] = base_value
-            elif stat_name == "speed":
-                stats_data["speed"] = base_value
+            stat_name = _STAT_NAME_MAP.get(api_stat_name)
+            if stat_name:
+                stats_data[stat_name] = base_stat
         
+        # Stats are checked by Pydantic (it's only six numbers), so a reply missing one fails right here
         stats = Stats(**stats_data)
         
         # Extract abilities
         abilities = []
-        for ability_info in pokemon_data["abilities"]:
-            abilities.append(ability_info["ability"]["name"].replace("-", " ").title())
+        for ability_name in ability_names:
+            abilities.append(_norm(ability_name))
         
         # Extract some moves (we'll limit to first 10 to keep it simple)
         moves = []
-        for move_info in pokemon_data["moves"][:10]:
-            move_name = move_info["move"]["name"].replace("-", " ").title()
+        for move_name in move_names:
+            move_name = _norm(move_name)
             # For now, we'll create simple moves. In a full version, we'd fetch move details
-            moves.append(Move(
+            moves.append(Move.model_construct(
                 name=move_name,
                 type=types[0] if types else PokemonType.NORMAL,  # Default to first type
                 power=80,  # Default power
@@ -117,10 +372,12 @@ class PokemonDataFetcher:
             ))
         
         # Extract physical characteristics
-        height = pokemon_data["height"] / 10.0  # API gives in decimeters, convert to meters
-        weight = pokemon_data["weight"] / 10.0  # API gives in hectograms, convert to kg
+        height = height / 10.0  # API gives in decimeters, convert to meters
+        weight = weight / 10.0  # API gives in hectograms, convert to kg
         
-        return Pokemon(
+        # The rest of the API data is already well-typed, so moves and the Pokemon itself
+        # skip Pydantic validation with model_construct
+        return Pokemon.model_construct(
             id=pokemon_id,
             name=name,
             types=types,
@@ -148,7 +405,7 @@ async def test_pokemon_fetcher():
     pikachu = await get_pokemon("pikachu")
     if pikachu:
         print(f"Successfully fetched: {pikachu.name}")
-        print(f"Types: {[t.value for t in pikachu.types]}")
+        print(f"Types: {list(pikachu.type_values)}")
         print(f"HP: {pikachu.stats.hp}")
         print(f"First move: {pikachu.moves[0].name if pikachu.moves else 'No moves'}")
     else:
@@ -12,16 +12,25 @@ from typing import Any, Dict, List, Optional
 from .pokemon_data import get_pokemon, pokemon_fetcher
 from .battle_simulator import simulate_pokemon_battle
 from .models import Pokemon, BattleResult
+from .type_chart import TYPE_CHART, TYPE_INDEX
+from . import _json
+
+# What to say for each multiplier - anything else counts as normal damage
+_EFFECT_TEXT = {
+    2.0: "Super effective! (2x damage)",
+    0.5: "Not very effective... (0.5x damage)",
+    0.0: "No effect! (0x damage)",
+    1.0: "Normal effectiveness (1x damage)"
+}
 
 class PokemonServer:
     """Core Pokemon server functionality"""
     
     def __init__(self):
         self.name = "pokemon-server"
-    
-    async def list_resources(self) -> List[Dict[str, Any]]:
-        """List available Pokemon resources"""
-        return [
+        
+        # Resources and tools never change, so build them (and the resource JSON) once
+        self._resources = [
             {
                 "uri": "pokemon://database",
                 "name": "Pokemon Database",
@@ -35,45 +44,37 @@ class PokemonServer:
                 "mimeType": "application/json"
             }
         ]
-    
-    async def read_resource(self, uri: str) -> str:
-        """Read a specific resource"""
-        if uri == "pokemon://database":
-            database_info = {
-                "name": "Pokemon Database",
-                "description": "Access to comprehensive Pokemon data",
-                "capabilities": [
-                    "Fetch individual Pokemon data by name or ID",
-                    "Get Pokemon stats and battle information", 
-                    "Access type effectiveness data",
-                    "Retrieve move lists and abilities"
-                ],
-                "usage_examples": [
-                    "Get Pokemon data: Use get_pokemon with a Pokemon name",
-                    "Battle simulation: Use simulate_battle with two Pokemon names"
-                ]
-            }
-            return json.dumps(database_info, indent=2)
         
-        elif uri == "pokemon://pokedex":
-            pokedex_info = {
-                "description": "Digital Pokemon encyclopedia",
-                "available_data": {
-                    "basic_info": ["name", "id", "types", "height", "weight"],
-                    "battle_stats": ["hp", "attack", "defense", "special_attack", "special_defense", "speed"],
-                    "abilities": "List of Pokemon abilities",
-                    "moves": "Available moves with power, accuracy, and type"
-                },
-                "supported_pokemon": "All Pokemon from the official Pokedex (900+ species)"
-            }
-            return json.dumps(pokedex_info, indent=2)
+        database_info = {
+            "name": "Pokemon Database",
+            "description": "Access to comprehensive Pokemon data",
+            "capabilities": [
+                "Fetch individual Pokemon data by name or ID",
+                "Get Pokemon stats and battle information", 
+                "Access type effectiveness data",
+                "Retrieve move lists and abilities"
+            ],
+            "usage_examples": [
+                "Get Pokemon data: Use get_pokemon with a Pokemon name",
+                "Battle simulation: Use simulate_battle with two Pokemon names"
+            ]
+        }
+        pokedex_info = {
+            "description": "Digital Pokemon encyclopedia",
+            "available_data": {
+                "basic_info": ["name", "id", "types", "height", "weight"],
+                "battle_stats": ["hp", "attack", "defense", "special_attack", "special_defense", "speed"],
+                "abilities": "List of Pokemon abilities",
+                "moves": "Available moves with power, accuracy, and type"
+            },
+            "supported_pokemon": "All Pokemon from the official Pokedex (900+ species)"
+        }
+        self._resource_cache = {
+            "pokemon://database": _json.dumps(database_info, pretty=True),
+            "pokemon://pokedex": _json.dumps(pokedex_info, pretty=True)
+        }
         
-        else:
-            raise ValueError(f"Unknown resource URI: {uri}")
-    
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools"""
-        return [
+        self._tools = [
             {
                 "name": "get_pokemon",
                 "description": "Get detailed information about a specific Pokemon",
@@ -116,31 +117,43 @@ class PokemonServer:
             }
         ]
     
+    async def aclose(self):
+        """Shut down - closes the Pokemon API connections"""
+        await pokemon_fetcher.aclose()
+    
+    async def list_resources(self) -> List[Dict[str, Any]]:
+        """List available Pokemon resources"""
+        return self._resources
+    
+    async def read_resource(self, uri: str) -> str:
+        """Read a specific resource"""
+        try:
+            return self._resource_cache[uri]
+        except KeyError:
+            raise ValueError(f"Unknown resource URI: {uri}")
+    
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """List available tools"""
+        return self._tools
+    
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
         """Call a specific tool"""
         
         if name == "get_pokemon":
             name_or_id = arguments.get("name_or_id")
             if not name_or_id:
-                return json.dumps({"error": "Pokemon name or ID is required"})
+                return _json.dumps({"error": "Pokemon name or ID is required"})
             
             try:
                 pokemon = await get_pokemon(name_or_id)
                 if not pokemon:
-                    return json.dumps({"error": f"Pokemon '{name_or_id}' not found"})
+                    return _json.dumps({"error": f"Pokemon '{name_or_id}' not found"})
                 
                 pokemon_info = {
                     "name": pokemon.name,
                     "id": pokemon.id,
-                    "types": [t.value for t in pokemon.types],
-                    "stats": {
-                        "hp": pokemon.stats.hp,
-                        "attack": pokemon.stats.attack,
-                        "defense": pokemon.stats.defense,
-                        "special_attack": pokemon.stats.special_attack,
-                        "special_defense": pokemon.stats.special_defense,
-                        "speed": pokemon.stats.speed
-                    },
+                    "types": list(pokemon.type_values),
+                    "stats": pokemon.stats_dict,
                     "abilities": pokemon.abilities,
                     "height": f"{pokemon.height}m",
                     "weight": f"{pokemon.weight}kg",
@@ -153,19 +166,23 @@ class PokemonServer:
                         } for move in pokemon.moves[:5]
                     ]
                 }
-                return json.dumps(pokemon_info, indent=2)
+                return _json.dumps(pokemon_info, pretty=True)
                 
             except Exception as e:
-                return json.dumps({"error": f"Error fetching Pokemon: {str(e)}"})
+                return _json.dumps({"error": f"Error fetching Pokemon: {str(e)}"})
         
         elif name == "simulate_battle":
             pokemon1 = arguments.get("pokemon1")
             pokemon2 = arguments.get("pokemon2")
             
             if not pokemon1 or not pokemon2:
-                return json.dumps({"error": "Both Pokemon names are required"})
+                return _json.dumps({"error": "Both Pokemon names are required"})
             
             try:
+                # Look up both Pokemon at the same time, so the battle starts with both already cached
+                found1, found2 = await asyncio.gather(get_pokemon(pokemon1), get_pokemon(pokemon2))
+                if not found1 or not found2:
+                    return _json.dumps({"error": "Error simulating battle: One or both Pokemon not found!"})
                 result = await simulate_pokemon_battle(pokemon1, pokemon2)
                 
                 battle_summary = {
@@ -188,36 +205,26 @@ class PokemonServer:
                     ],
                     "note": f"Showing first 10 of {len(result.battle_log)} total battle actions"
                 }
-                return json.dumps(battle_summary, indent=2)
+                return _json.dumps(battle_summary, pretty=True)
                 
             except Exception as e:
-                return json.dumps({"error": f"Error simulating battle: {str(e)}"})
+                return _json.dumps({"error": f"Error simulating battle: {str(e)}"})
         
         elif name == "get_type_effectiveness":
             attacking_type = arguments.get("attacking_type", "").lower()
             defending_type = arguments.get("defending_type", "").lower()
             
             if not attacking_type or not defending_type:
-                return json.dumps({"error": "Both attacking and defending types are required"})
+                return _json.dumps({"error": "Both attacking and defending types are required"})
             
-            # Type effectiveness lookup
-            type_chart = {
-                "fire": {"grass": 2.0, "ice": 2.0, "bug": 2.0, "steel": 2.0, "water": 0.5, "rock": 0.5, "fire": 0.5, "dragon": 0.5},
-                "water": {"fire": 2.0, "ground": 2.0, "rock": 2.0, "grass": 0.5, "water": 0.5, "dragon": 0.5},
-                "electric": {"water": 2.0, "flying": 2.0, "grass": 0.5, "electric": 0.5, "dragon": 0.5, "ground": 0.0},
-                "grass": {"water": 2.0, "ground": 2.0, "rock": 2.0, "fire": 0.5, "grass": 0.5, "poison": 0.5, "flying": 0.5, "bug": 0.5, "dragon": 0.5, "steel": 0.5}
-            }
-            
-            effectiveness = type_chart.get(attacking_type, {}).get(defending_type, 1.0)
-            
-            if effectiveness == 2.0:
-                effect_text = "Super effective! (2x damage)"
-            elif effectiveness == 0.5:
-                effect_text = "Not very effective... (0.5x damage)"
-            elif effectiveness == 0.0:
-                effect_text = "No effect! (0x damage)"
+            # Type effectiveness lookup in the shared chart (types we don't know count as normal damage)
+            attack_index = TYPE_INDEX.get(attacking_type)
+            defend_index = TYPE_INDEX.get(defending_type)
+            if attack_index is None or defend_index is None:
+                effectiveness = 1.0
             else:
-                effect_text = "Normal effectiveness (1x damage)"
+                effectiveness = float(TYPE_CHART[attack_index, defend_index])
+            effect_text = _EFFECT_TEXT.get(effectiveness, _EFFECT_TEXT[1.0])
             
             result = {
                 "attacking_type": attacking_type.title(),
@@ -225,10 +232,10 @@ class PokemonServer:
                 "effectiveness_multiplier": effectiveness,
                 "effect": effect_text
             }
-            return json.dumps(result, indent=2)
+            return _json.dumps(result, pretty=True)
         
         else:
-            return json.dumps({"error": f"Unknown tool: {name}"})
+            return _json.dumps({"error": f"Unknown tool: {name}"})
 
 # Create global server instance
 server = PokemonServer()
@@ -257,6 +264,8 @@ async def test_server():
         print(f"✅ Battle completed - Winner: {battle_data['battle_result']['winner']}")
     else:
         print(f"❌ Battle error: {battle_data['error']}")
+    
+    await server.aclose()
 
 if __name__ == "__main__":
     asyncio.run(test_server())
\ No newline at end of file
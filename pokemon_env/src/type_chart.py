@@ -0,0 +1,114 @@
+"""
+Type Chart - which types are strong against which
+One copy of the full chart, shared by the battle simulator and the server
+"""
+
+import numpy as np
+from typing import Iterable
+from .models import PokemonType
+
+# Position of each type in the chart (plain strings like "fire" work as keys too)
+TYPE_INDEX = {t: i for i, t in enumerate(PokemonType)}
+
+# 2.0 = super effective, 0.5 = not very effective, 0.0 = no effect
+# Anything not listed is normal effectiveness (1.0)
+_TYPE_EFFECTIVENESS = {
+    PokemonType.NORMAL: {
+        PokemonType.ROCK: 0.5, PokemonType.STEEL: 0.5,
+        PokemonType.GHOST: 0.0
+    },
+    PokemonType.FIRE: {
+        PokemonType.GRASS: 2.0, PokemonType.ICE: 2.0, PokemonType.BUG: 2.0, PokemonType.STEEL: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.WATER: 0.5, PokemonType.ROCK: 0.5, PokemonType.DRAGON: 0.5
+    },
+    PokemonType.WATER: {
+        PokemonType.FIRE: 2.0, PokemonType.GROUND: 2.0, PokemonType.ROCK: 2.0,
+        PokemonType.WATER: 0.5, PokemonType.GRASS: 0.5, PokemonType.DRAGON: 0.5
+    },
+    PokemonType.ELECTRIC: {
+        PokemonType.WATER: 2.0, PokemonType.FLYING: 2.0,
+        PokemonType.ELECTRIC: 0.5, PokemonType.GRASS: 0.5, PokemonType.DRAGON: 0.5,
+        PokemonType.GROUND: 0.0
+    },
+    PokemonType.GRASS: {
+        PokemonType.WATER: 2.0, PokemonType.GROUND: 2.0, PokemonType.ROCK: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.GRASS: 0.5, PokemonType.POISON: 0.5, PokemonType.FLYING: 0.5, PokemonType.BUG: 0.5, PokemonType.DRAGON: 0.5, PokemonType.STEEL: 0.5
+    },
+    PokemonType.ICE: {
+        PokemonType.GRASS: 2.0, PokemonType.GROUND: 2.0, PokemonType.FLYING: 2.0, PokemonType.DRAGON: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.WATER: 0.5, PokemonType.ICE: 0.5, PokemonType.STEEL: 0.5
+    },
+    PokemonType.FIGHTING: {
+        PokemonType.NORMAL: 2.0, PokemonType.ICE: 2.0, PokemonType.ROCK: 2.0, PokemonType.DARK: 2.0, PokemonType.STEEL: 2.0,
+        PokemonType.POISON: 0.5, PokemonType.FLYING: 0.5, PokemonType.PSYCHIC: 0.5, PokemonType.BUG: 0.5, PokemonType.FAIRY: 0.5,
+        PokemonType.GHOST: 0.0
+    },
+    PokemonType.POISON: {
+        PokemonType.GRASS: 2.0, PokemonType.FAIRY: 2.0,
+        PokemonType.POISON: 0.5, PokemonType.GROUND: 0.5, PokemonType.ROCK: 0.5, PokemonType.GHOST: 0.5,
+        PokemonType.STEEL: 0.0
+    },
+    PokemonType.GROUND: {
+        PokemonType.FIRE: 2.0, PokemonType.ELECTRIC: 2.0, PokemonType.POISON: 2.0, PokemonType.ROCK: 2.0, PokemonType.STEEL: 2.0,
+        PokemonType.GRASS: 0.5, PokemonType.BUG: 0.5,
+        PokemonType.FLYING: 0.0
+    },
+    PokemonType.FLYING: {
+        PokemonType.GRASS: 2.0, PokemonType.FIGHTING: 2.0, PokemonType.BUG: 2.0,
+        PokemonType.ELECTRIC: 0.5, PokemonType.ROCK: 0.5, PokemonType.STEEL: 0.5
+    },
+    PokemonType.PSYCHIC: {
+        PokemonType.FIGHTING: 2.0, PokemonType.POISON: 2.0,
+        PokemonType.PSYCHIC: 0.5, PokemonType.STEEL: 0.5,
+        PokemonType.DARK: 0.0
+    },
+    PokemonType.BUG: {
+        PokemonType.GRASS: 2.0, PokemonType.PSYCHIC: 2.0, PokemonType.DARK: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.FIGHTING: 0.5, PokemonType.POISON: 0.5, PokemonType.FLYING: 0.5, PokemonType.GHOST: 0.5, PokemonType.STEEL: 0.5, PokemonType.FAIRY: 0.5
+    },
+    PokemonType.ROCK: {
+        PokemonType.FIRE: 2.0, PokemonType.ICE: 2.0, PokemonType.FLYING: 2.0, PokemonType.BUG: 2.0,
+        PokemonType.FIGHTING: 0.5, PokemonType.GROUND: 0.5, PokemonType.STEEL: 0.5
+    },
+    PokemonType.GHOST: {
+        PokemonType.PSYCHIC: 2.0, PokemonType.GHOST: 2.0,
+        PokemonType.DARK: 0.5,
+        PokemonType.NORMAL: 0.0
+    },
+    PokemonType.DRAGON: {
+        PokemonType.DRAGON: 2.0,
+        PokemonType.STEEL: 0.5,
+        PokemonType.FAIRY: 0.0
+    },
+    PokemonType.DARK: {
+        PokemonType.PSYCHIC: 2.0, PokemonType.GHOST: 2.0,
+        PokemonType.FIGHTING: 0.5, PokemonType.DARK: 0.5, PokemonType.FAIRY: 0.5
+    },
+    PokemonType.STEEL: {
+        PokemonType.ICE: 2.0, PokemonType.ROCK: 2.0, PokemonType.FAIRY: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.WATER: 0.5, PokemonType.ELECTRIC: 0.5, PokemonType.STEEL: 0.5
+    },
+    PokemonType.FAIRY: {
+        PokemonType.FIGHTING: 2.0, PokemonType.DRAGON: 2.0, PokemonType.DARK: 2.0,
+        PokemonType.FIRE: 0.5, PokemonType.POISON: 0.5, PokemonType.STEEL: 0.5
+    },
+}
+
+# The chart packed into an 18x18 array: row = attacking type, column = defending type
+TYPE_CHART = np.ones((len(PokemonType), len(PokemonType)), dtype=np.float32)
+for _attack_type, _matchups in _TYPE_EFFECTIVENESS.items():
+    for _defend_type, _multiplier in _matchups.items():
+        TYPE_CHART[TYPE_INDEX[_attack_type], TYPE_INDEX[_defend_type]] = _multiplier
+TYPE_CHART.flags.writeable = False  # Shared by everyone, so nobody gets to change it
+
+def type_effectiveness(attack_type: PokemonType, defend_type: PokemonType) -> float:
+    """Damage multiplier for one attacking type against one defending type"""
+    return float(TYPE_CHART[TYPE_INDEX[attack_type], TYPE_INDEX[defend_type]])
+
+def dual_type_effectiveness(attack_type: PokemonType, defend_types: Iterable[PokemonType]) -> float:
+    """Damage multiplier against a Pokemon with one or two types - the multipliers stack"""
+    row = TYPE_CHART[TYPE_INDEX[attack_type]]
+    multiplier = 1.0
+    for defend_type in defend_types:
+        multiplier *= float(row[TYPE_INDEX[defend_type]])
+    return multiplier
@@ -12,9 +12,45 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from pokemon_env.src.models import Pokemon, Move, Stats, BattlePokemon
-from pokemon_env.src.pokemon_data import get_pokemon
+from pokemon_env.src.pokemon_data import get_pokemon, pokemon_fetcher
 from pokemon_env.src.battle_simulator import simulate_pokemon_battle
 
+def test_api_converters():
+    """Test that the REST and GraphQL replies turn into the same Pokemon (no internet needed)"""
+    print("🔄 Testing REST and GraphQL Conversion...")
+    print("-" * 40)
+    
+    stat_names = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+    base_stats = [35, 55, 40, 50, 50, 90]
+    move_names = [f"thunder-{i}" for i in range(12)]
+    
+    # A cut-down copy of what each API sends back for Pikachu
+    rest_data = {
+        "id": 25, "name": "pikachu", "height": 4, "weight": 60,
+        "types": [{"slot": 1, "type": {"name": "electric"}}],
+        "stats": [{"base_stat": value, "stat": {"name": name}} for name, value in zip(stat_names, base_stats)],
+        "abilities": [{"ability": {"name": "static"}}, {"ability": {"name": "lightning-rod"}}],
+        "moves": [{"move": {"name": name}} for name in move_names]
+    }
+    graphql_data = {
+        "id": 25, "name": "pikachu", "height": 4, "weight": 60,
+        "pokemon_v2_pokemontypes": [{"pokemon_v2_type": {"name": "electric"}}],
+        "pokemon_v2_pokemonstats": [{"base_stat": value, "pokemon_v2_stat": {"name": name}} for name, value in zip(stat_names, base_stats)],
+        "pokemon_v2_pokemonabilities": [{"pokemon_v2_ability": {"name": "static"}}, {"pokemon_v2_ability": {"name": "lightning-rod"}}],
+        "pokemon_v2_pokemonmoves": [{"pokemon_v2_move": {"name": name}} for name in move_names[:10]]
+    }
+    
+    from_rest = pokemon_fetcher._convert_api_data_to_pokemon(rest_data, {"name": "pikachu"})
+    from_graphql = pokemon_fetcher._convert_graphql_data_to_pokemon(graphql_data)
+    if from_rest == from_graphql:
+        print("✅ Both APIs give the same Pokemon!")
+        return True
+    
+    print("❌ REST and GraphQL gave different Pokemon:")
+    print(f"   REST:    {from_rest}")
+    print(f"   GraphQL: {from_graphql}")
+    return False
+
 async def test_pokemon_fetching():
     """Test if we can get Pokemon data"""
     print("🔍 Testing Pokemon Data Fetching...")
@@ -25,7 +61,7 @@ async def test_pokemon_fetching():
     if pikachu:
         print("✅ Successfully fetched Pikachu!")
         print(f"   Name: {pikachu.name}")
-        print(f"   Types: {[t.value for t in pikachu.types]}")
+        print(f"   Types: {list(pikachu.type_values)}")
         print(f"   HP: {pikachu.stats.hp}")
         print(f"   Attack: {pikachu.stats.attack}")
         print(f"   Speed: {pikachu.stats.speed}")
@@ -45,7 +81,7 @@ async def test_pokemon_fetching():
     if charizard:
         print("✅ Successfully fetched Charizard!")
         print(f"   Name: {charizard.name}")
-        print(f"   Types: {[t.value for t in charizard.types]}")
+        print(f"   Types: {list(charizard.type_values)}")
         print(f"   HP: {charizard.stats.hp}")
     else:
         print("❌ Failed to fetch Charizard")
@@ -83,20 +119,33 @@ async def test_battle_simulation():
         print(f"❌ Battle simulation failed: {e}")
         return False
 
-async def main():
+def main():
     """Run all tests"""
     print("🧪 Starting Pokemon MCP Server Tests")
     print("=" * 50)
     
-    # Test 1: Pokemon data fetching
-    data_test_passed = await test_pokemon_fetching()
-    
-    if not data_test_passed:
-        print("❌ Data fetching failed. Cannot proceed to battle tests.")
+    # Test 0: The two API converters agree (runs offline)
+    if not test_api_converters():
+        print("❌ Conversion check failed. Cannot proceed to the other tests.")
         return
+    print()
     
-    # Test 2: Battle simulation
-    battle_test_passed = await test_battle_simulation()
+    # One event loop for every test, so Pokemon fetched by one test are still
+    # cached (and the API connections still open) for the next
+    loop = asyncio.new_event_loop()
+    try:
+        # Test 1: Pokemon data fetching
+        data_test_passed = loop.run_until_complete(test_pokemon_fetching())
+        
+        if not data_test_passed:
+            print("❌ Data fetching failed. Cannot proceed to battle tests.")
+            return
+        
+        # Test 2: Battle simulation
+        battle_test_passed = loop.run_until_complete(test_battle_simulation())
+    finally:
+        loop.run_until_complete(pokemon_fetcher.aclose())
+        loop.close()
     
     # Summary
     print("\n" + "=" * 50)
@@ -111,4 +160,4 @@ async def main():
         print("\n⚠️ Some tests failed. Check the error messages above.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
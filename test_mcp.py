@@ -131,9 +131,15 @@ async def test_pokemon_server():
     
     return True
 
-async def main():
+def main():
     """Run all Pokemon server tests"""
-    success = await test_pokemon_server()
+    # Run on an event loop we keep hold of, so the server's connections can be closed on the same loop
+    loop = asyncio.new_event_loop()
+    try:
+        success = loop.run_until_complete(test_pokemon_server())
+    finally:
+        loop.run_until_complete(server.aclose())
+        loop.close()
     
     if success:
         print("\n🚀 Your Pokemon server is fully functional!")
@@ -148,4 +154,4 @@ async def main():
         print("\n⚠️ Some tests failed. Check the error messages above.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file